@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+check_cron.py - Compare generate.get_occurrences against a plain croniter walk,
+then render jobs with null/missing fields through generate_html
+Run after touching parse_cron/_cron_ticks: python3 scripts/check_cron.py [cases] [seed]
+Exits non-zero and prints the first mismatches if any case differs.
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+
+from croniter import croniter
+
+import generate
+
+TZS = [
+    "UTC", "Asia/Taipei", "America/New_York", "Europe/London", "Australia/Sydney",
+    "America/Santiago", "Asia/Kolkata", "Pacific/Chatham", "America/Havana",
+]
+# Extended syntax that must fall through to croniter
+EXTENDED = ["@daily", "@hourly", "0 0 L * *", "0 0 * * 1#2", "0 0 * * 5L", "0 0 0 * * *", "x y"]
+
+def reference_occurrences(job, week_days):
+    """The original croniter-only walk get_occurrences must reproduce."""
+    job_tz = generate._zi(job.get("tz") or "UTC")
+    week_start = week_days[0].astimezone(job_tz) - timedelta(hours=1)
+    week_end = week_days[-1].astimezone(job_tz) + timedelta(hours=25)
+    results = []
+    try:
+        it = croniter(job["cron"], week_start)
+        while True:
+            next_run = it.get_next(datetime)
+            if next_run > week_end:
+                break
+            next_display = next_run.astimezone(generate.DISPLAY_TZ)
+            results.append((next_display.weekday(), next_display.hour, next_display.minute))
+    except Exception:
+        pass
+    return results
+
+def random_field(rng, lo, hi, names=()):
+    r = rng.random()
+    if r < 0.3:
+        return "*"
+    if r < 0.45:
+        return f"*/{rng.randint(1, hi - lo + 1)}"
+    if r < 0.6:
+        a = rng.randint(lo, hi - 1)
+        b = rng.randint(a + 1, hi)
+        return f"{a}-{b}" + (f"/{rng.randint(1, 5)}" if rng.random() < 0.3 else "")
+    if r < 0.8:
+        return ",".join(map(str, rng.sample(range(lo, hi + 1), rng.randint(1, 3))))
+    if r < 0.85 and names:
+        return rng.choice(names)
+    if r < 0.9:
+        return f"{rng.randint(lo, hi)}/{rng.randint(1, 7)}"
+    return str(rng.randint(lo, hi))
+
+def random_expr(rng):
+    if rng.random() < 0.05:
+        return rng.choice(EXTENDED)
+    fields = [
+        random_field(rng, 0, 59),
+        random_field(rng, 0, 23),
+        random_field(rng, 1, 31),
+        random_field(rng, 1, 12, ["jan", "FEB", "dec"]),
+        random_field(rng, 0, 7, ["mon", "sun", "SAT", "mon-fri", "sat-sun"]),
+    ]
+    # Mostly keep one of dom/dow as "*" so the bitmask path is exercised
+    if rng.random() < 0.8:
+        fields[rng.choice([2, 4])] = "*"
+    return " ".join(fields)
+
+# Jobs straight from the openclaw CLI may carry nulls or omit fields
+SPARSE_JOBS = [
+    {"name": "null-description", "description": None, "cron": "0 9 * * *", "tz": "UTC",
+     "color": "#58A6FF", "tag": "openclaw"},
+    {"name": "no-description", "cron": "0 0 1 1 *", "tz": "UTC", "color": "#58A6FF", "tag": "openclaw"},
+    {"name": None, "description": "null name", "cron": "30 12 * * *", "tz": "UTC",
+     "color": "#58A6FF", "tag": "openclaw"},
+    {"name": "null-color-tag", "description": "", "cron": "0 18 * * *", "tz": "UTC",
+     "color": None, "tag": None},
+]
+
+def check_render():
+    """generate_html must render jobs with null or missing text fields."""
+    now = datetime.now(generate.DISPLAY_TZ)
+    try:
+        generate.generate_html(SPARSE_JOBS, generate.get_week_range(now), now)
+    except Exception as e:
+        sys.exit(f"generate_html failed on sparse jobs: {e!r}")
+    print(f"✅ {len(SPARSE_JOBS)} sparse jobs render")
+
+def main():
+    cases = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    rng = random.Random(seed)
+    first_monday = datetime(2026, 1, 5, tzinfo=generate.DISPLAY_TZ)
+
+    mismatches = []
+    for _ in range(cases):
+        job = {"cron": random_expr(rng), "tz": rng.choice(TZS)}
+        monday = first_monday + timedelta(weeks=rng.randint(0, 104))
+        week_days = [monday + timedelta(days=i) for i in range(7)]
+        expected = sorted(reference_occurrences(job, week_days))
+        actual = sorted(generate.get_occurrences(job, week_days))
+        if actual != expected:
+            mismatches.append((job, monday.date(), len(expected), len(actual)))
+
+    for job, week, n_expected, n_actual in mismatches[:10]:
+        print(f"❌ {job['cron']!r} {job['tz']} week of {week}: croniter {n_expected}, generate {n_actual}")
+    if mismatches:
+        sys.exit(f"{len(mismatches)} of {cases} cases differ")
+    print(f"✅ {cases} cases match croniter")
+
+    check_render()
+
+if __name__ == "__main__":
+    main()
@@ -1,87 +1,268 @@
 #!/usr/bin/env python3
 """
 generate.py - Generate a 7-day weekly calendar HTML from jobs.json
-Outputs: docs/index.html
+Outputs: docs/index.html, docs/style.css
 """
 
-import json
+import copy
 import os
+from functools import lru_cache
+from html import escape
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from croniter import croniter
+import orjson
 
 DISPLAY_TZ = ZoneInfo("Asia/Taipei")
 DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 HOURS = list(range(0, 24))
+HOUR_LABELS = tuple(f"{h:02d}:00" for h in HOURS)
 
-def get_week_range():
-    """Return Monday to Sunday of current week in display TZ."""
-    now = datetime.now(DISPLAY_TZ)
+STYLE_CSS = """\
+* { box-sizing: border-box; margin: 0; padding: 0; }
+body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; background: #0d1117; color: #e6edf3; }
+.container { max-width: 1200px; margin: 0 auto; padding: 24px 16px; }
+h1 { font-size: 1.6rem; margin-bottom: 4px; }
+h1 span { font-size: 1rem; color: #8b949e; font-weight: normal; margin-left: 8px; }
+.meta { color: #8b949e; font-size: 0.85rem; margin-bottom: 16px; }
+.legend { display: flex; gap: 16px; flex-wrap: wrap; margin-bottom: 20px; }
+.legend-item { display: flex; align-items: center; gap: 6px; font-size: 0.85rem; }
+.legend-dot { width: 12px; height: 12px; border-radius: 3px; }
+.calendar { overflow-x: auto; }
+table { width: 100%; border-collapse: collapse; min-width: 700px; }
+th, td { border: 1px solid #21262d; }
+.corner { width: 52px; background: #161b22; }
+.day-header { background: #161b22; text-align: center; padding: 8px 4px; font-size: 0.85rem; font-weight: 600; min-width: 120px; }
+.day-header.today { background: #1f3a5f; color: #58a6ff; }
+.day-date { font-size: 0.75rem; font-weight: normal; color: #8b949e; }
+.day-header.today .day-date { color: #58a6ff; }
+.hour-label { width: 52px; text-align: right; padding: 0 8px; font-size: 0.72rem; color: #8b949e; background: #161b22; vertical-align: top; padding-top: 4px; white-space: nowrap; }
+.cell { height: 36px; padding: 2px; vertical-align: top; background: #0d1117; }
+.cell:hover { background: #161b22; }
+.has-event { background: #0d1117; }
+.event { border-radius: 4px; padding: 2px 5px; font-size: 0.72rem; font-weight: 500; color: #fff; margin-bottom: 2px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; cursor: default; opacity: 0.92; }
+.event:hover { opacity: 1; }
+footer { margin-top: 24px; text-align: center; color: #8b949e; font-size: 0.8rem; }
+"""
+
+@lru_cache(maxsize=64)
+def _zi(name):
+    """Return the ZoneInfo for name, memoized across jobs sharing a TZ."""
+    return ZoneInfo(name)
+
+def get_week_range(now):
+    """Return Monday to Sunday of the week containing now (display TZ)."""
     monday = now - timedelta(days=now.weekday())
     monday = monday.replace(hour=0, minute=0, second=0, microsecond=0)
     return [monday + timedelta(days=i) for i in range(7)]
 
+# (lo, hi) per cron field: minute, hour, day-of-month, month, day-of-week
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+CRON_NAMES = (
+    {},
+    {},
+    {},
+    {m: i for i, m in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)},
+    {d: i for i, d in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])},
+)
+
+def _cron_value(token, names):
+    """Return the numeric value of a cron token (digits or a field name)."""
+    token = token.lower()
+    if token in names:
+        return names[token]
+    if not token.isdigit():
+        raise ValueError(f"unsupported cron token: {token!r}")
+    return int(token)
+
+@lru_cache(maxsize=256)
+def parse_cron(expr):
+    """Parse a 5-field cron expression into (minute, hour, dom, month, dow) bitmasks.
+
+    Bit n is set when value n matches (dow: 0=Sun). Only plain values, names,
+    lists, ascending ranges and steps on "*" or ranges are accepted, and dom
+    or dow must be "*"; anything else raises ValueError so the caller can
+    defer to croniter, whose semantics for the remaining forms are looser.
+    """
+    fields = expr.split()
+    if len(fields) != 5:
+        raise ValueError(f"unsupported cron expression: {expr!r}")
+    if fields[2] != "*" and fields[4] != "*":
+        raise ValueError(f"dom/dow union not supported: {expr!r}")
+
+    masks = []
+    for idx, field in enumerate(fields):
+        lo, hi = CRON_FIELDS[idx]
+        names = CRON_NAMES[idx]
+        max_value = 7 if idx == 4 else hi  # dow accepts 7 as Sunday
+
+        mask = 0
+        for part in field.split(","):
+            base, slash, step = part.partition("/")
+            if slash and not step.isdigit():
+                raise ValueError(f"unsupported cron step: {part!r}")
+            step = int(step) if slash else 1
+            if base == "*":
+                start, stop = lo, hi
+            elif "-" in base:
+                a, b = base.split("-", 1)
+                start, stop = _cron_value(a, names), _cron_value(b, names)
+                if start == stop:
+                    raise ValueError(f"unsupported cron range: {base!r}")
+            elif not slash:
+                start = stop = _cron_value(base, names)
+            else:
+                raise ValueError(f"unsupported cron step: {part!r}")
+            if step < 1 or not lo <= start <= stop <= max_value:
+                raise ValueError(f"unsupported cron field: {field!r}")
+            for v in range(start, stop + 1, step):
+                mask |= 1 << v
+        if idx == 4 and mask & (1 << 7):
+            mask = (mask | 1) & ~(1 << 7)
+        masks.append(mask)
+
+    return tuple(masks)
+
+@lru_cache(maxsize=256)
+def _expand(expr_format, args, kwargs):
+    """Return croniter's parsed expansion of expr_format, memoized."""
+    return croniter._expand(expr_format, *args, **dict(kwargs))
+
+class _CachedCroniter(croniter):
+    """croniter that parses each distinct expression only once."""
+
+    @classmethod
+    def _expand(cls, expr_format, *args, **kwargs):
+        # Forward whatever this croniter version passes; an unhashable argument
+        # or a signature mismatch means parsing uncached rather than losing ticks
+        try:
+            expanded = _expand(expr_format, args, tuple(sorted(kwargs.items())))
+        except TypeError:
+            return super()._expand(expr_format, *args, **kwargs)
+        # croniter mutates the nth-weekday sets while iterating; hand out a copy
+        return copy.deepcopy(expanded)
+
+def _croniter_ticks(cron_expr, job_tz, start_ts, end_ts):
+    """Yield POSIX timestamps of croniter ticks in (start_ts, end_ts)."""
+    it = _CachedCroniter(cron_expr, datetime.fromtimestamp(start_ts, job_tz))
+    while True:
+        ts = it.get_next(float)
+        if ts >= end_ts:
+            return
+        yield ts
+
+def _cron_ticks(cron_expr, job_tz, week_start, week_end):
+    """Yield POSIX timestamps of cron ticks in (week_start, week_end]."""
+    start_ts = week_start.timestamp()
+    end_ts = week_end.timestamp()
+    try:
+        minute_mask, hour_mask, dom_mask, month_mask, dow_mask = parse_cron(cron_expr)
+    except ValueError:
+        # Extended syntax: let croniter handle the whole window
+        yield from _croniter_ticks(cron_expr, job_tz, start_ts, end_ts + 1)
+        return
+
+    day = week_start.date()
+    while day <= week_end.date():
+        if (month_mask >> day.month & 1 and dom_mask >> day.day & 1
+                and dow_mask >> (day.weekday() + 1) % 7 & 1):
+            day_start = datetime(day.year, day.month, day.day, tzinfo=job_tz)
+            day_ts = day_start.timestamp()
+            next_ts = (day_start + timedelta(days=1)).timestamp()
+            if next_ts - day_ts != 86400:
+                # DST transition today: defer gap/overlap handling to croniter,
+                # replayed from the window start as its result is path-dependent
+                for ts in _croniter_ticks(cron_expr, job_tz, start_ts, min(end_ts + 1, next_ts)):
+                    if ts >= day_ts:
+                        yield ts
+            else:
+                h = hour_mask
+                while h:
+                    b = h & -h
+                    hour_ts = day_ts + (b.bit_length() - 1) * 3600
+                    h ^= b
+                    m = minute_mask
+                    while m:
+                        b = m & -m
+                        ts = hour_ts + (b.bit_length() - 1) * 60
+                        m ^= b
+                        if start_ts < ts <= end_ts:
+                            yield ts
+        day += timedelta(days=1)
+
 def get_occurrences(job, week_days):
     """Return list of (day_index, hour, minute) for job in the current week."""
     cron_expr = job["cron"]
-    job_tz = ZoneInfo(job.get("tz", "UTC"))
+    job_tz = _zi(job.get("tz") or "UTC")
     results = []
 
     week_start = week_days[0].astimezone(job_tz) - timedelta(hours=1)
     week_end = week_days[-1].astimezone(job_tz) + timedelta(hours=25)
 
+    # Display offset is fixed across the window unless DISPLAY_TZ has a DST
+    # transition inside it; only then fall back to per-tick astimezone().
+    offset = week_start.astimezone(DISPLAY_TZ).utcoffset()
+    fixed_offset = offset == week_end.astimezone(DISPLAY_TZ).utcoffset()
+    offset_s = int(offset.total_seconds())
+
     try:
-        it = croniter(cron_expr, week_start)
-        while True:
-            next_run = it.get_next(datetime).replace(tzinfo=job_tz)
-            if next_run > week_end:
-                break
+        for ts in _cron_ticks(cron_expr, job_tz, week_start, week_end):
             # Convert to display TZ
-            next_display = next_run.astimezone(DISPLAY_TZ)
-            day_idx = next_display.weekday()  # 0=Mon
-            if 0 <= day_idx <= 6:
-                results.append((day_idx, next_display.hour, next_display.minute))
+            if fixed_offset:
+                local = int(ts) + offset_s
+                day_idx = (local // 86400 + 3) % 7  # 1970-01-01 was a Thursday
+                results.append((day_idx, local // 3600 % 24, local // 60 % 60))
+            else:
+                next_display = datetime.fromtimestamp(ts, DISPLAY_TZ)
+                results.append((next_display.weekday(), next_display.hour, next_display.minute))
     except Exception:
         pass
 
     return results
 
-def generate_html(jobs, week_days):
-    now = datetime.now(DISPLAY_TZ)
+def _esc(value):
+    """HTML-escape a job field, treating null/missing as empty."""
+    return escape(str(value or ""))
+
+def generate_html(jobs, week_days, now):
     week_label = f"{week_days[0].strftime('%Y/%m/%d')} – {week_days[6].strftime('%Y/%m/%d')}"
 
-    # Build event grid: grid[day][hour] = list of jobs
-    grid = [[[] for _ in range(24)] for _ in range(7)]
+    # Render (and escape) each job's event block once; every occurrence reuses it
+    job_html = {
+        id(job): f'<div class="event" style="background:{_esc(job.get("color"))}" '
+                 f'title="{_esc(job.get("description"))}">{_esc(job.get("name"))}</div>'
+        for job in jobs
+    }
+
+    # Build event grid: grid[day * 24 + hour] = list of event blocks
+    grid = [[] for _ in range(7 * 24)]
     for job in jobs:
         for (day_idx, hour, minute) in get_occurrences(job, week_days):
-            grid[day_idx][hour].append(job)
+            grid[day_idx * 24 + hour].append(job_html[id(job)])
 
     # Tag colors for legend
-    tag_colors = {}
-    for job in jobs:
-        tag_colors[job["tag"]] = job["color"]
+    tag_colors = {_esc(j.get("tag")): _esc(j.get("color")) for j in jobs}
 
+    today = now.date()
+    day_info = [(DAYS[i], wd.strftime("%m/%d"), wd.date() == today) for i, wd in enumerate(week_days)]
     day_headers = "".join(
-        f'<th class="day-header{"today" if week_days[i].date() == now.date() else ""}">'
-        f'{DAYS[i]}<br><span class="day-date">{week_days[i].strftime("%m/%d")}</span></th>'
-        for i in range(7)
+        f'<th class="day-header{" today" if is_today else ""}">'
+        f'{dname}<br><span class="day-date">{mmdd}</span></th>'
+        for dname, mmdd, is_today in day_info
     )
 
-    rows = ""
+    row_parts = []
     for hour in HOURS:
-        cells = ""
+        cell_parts = []
         for day in range(7):
-            events = grid[day][hour]
+            events = grid[day * 24 + hour]
             if events:
-                event_html = "".join(
-                    f'<div class="event" style="background:{j["color"]}" title="{j["description"]}">'
-                    f'{j["name"]}</div>'
-                    for j in events
-                )
-                cells += f'<td class="cell has-event">{event_html}</td>'
+                cell_parts.append(f'<td class="cell has-event">{"".join(events)}</td>')
             else:
-                cells += '<td class="cell"></td>'
-        rows += f'<tr><td class="hour-label">{hour:02d}:00</td>{cells}</tr>'
+                cell_parts.append('<td class="cell"></td>')
+        row_parts.append(f'<tr><td class="hour-label">{HOUR_LABELS[hour]}</td>{"".join(cell_parts)}</tr>')
+    rows = "".join(row_parts)
 
     legend = "".join(
         f'<span class="legend-item"><span class="legend-dot" style="background:{color}"></span>{tag}</span>'
@@ -94,32 +275,7 @@ def generate_html(jobs, week_days):
   <meta charset="UTF-8">
   <meta name="viewport" content="width=device-width, initial-scale=1.0">
   <title>🦞 OpenClaw Calendar</title>
-  <style>
-    * {{ box-sizing: border-box; margin: 0; padding: 0; }}
-    body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; background: #0d1117; color: #e6edf3; }}
-    .container {{ max-width: 1200px; margin: 0 auto; padding: 24px 16px; }}
-    h1 {{ font-size: 1.6rem; margin-bottom: 4px; }}
-    h1 span {{ font-size: 1rem; color: #8b949e; font-weight: normal; margin-left: 8px; }}
-    .meta {{ color: #8b949e; font-size: 0.85rem; margin-bottom: 16px; }}
-    .legend {{ display: flex; gap: 16px; flex-wrap: wrap; margin-bottom: 20px; }}
-    .legend-item {{ display: flex; align-items: center; gap: 6px; font-size: 0.85rem; }}
-    .legend-dot {{ width: 12px; height: 12px; border-radius: 3px; }}
-    .calendar {{ overflow-x: auto; }}
-    table {{ width: 100%; border-collapse: collapse; min-width: 700px; }}
-    th, td {{ border: 1px solid #21262d; }}
-    .corner {{ width: 52px; background: #161b22; }}
-    .day-header {{ background: #161b22; text-align: center; padding: 8px 4px; font-size: 0.85rem; font-weight: 600; min-width: 120px; }}
-    .day-header.today {{ background: #1f3a5f; color: #58a6ff; }}
-    .day-date {{ font-size: 0.75rem; font-weight: normal; color: #8b949e; }}
-    .day-header.today .day-date {{ color: #58a6ff; }}
-    .hour-label {{ width: 52px; text-align: right; padding: 0 8px; font-size: 0.72rem; color: #8b949e; background: #161b22; vertical-align: top; padding-top: 4px; white-space: nowrap; }}
-    .cell {{ height: 36px; padding: 2px; vertical-align: top; background: #0d1117; }}
-    .cell:hover {{ background: #161b22; }}
-    .has-event {{ background: #0d1117; }}
-    .event {{ border-radius: 4px; padding: 2px 5px; font-size: 0.72rem; font-weight: 500; color: #fff; margin-bottom: 2px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; cursor: default; opacity: 0.92; }}
-    .event:hover {{ opacity: 1; }}
-    footer {{ margin-top: 24px; text-align: center; color: #8b949e; font-size: 0.8rem; }}
-  </style>
+  <link rel="stylesheet" href="style.css">
 </head>
 <body>
   <div class="container">
@@ -139,20 +295,41 @@ def generate_html(jobs, week_days):
 </body>
 </html>"""
 
+def write_bytes(path, data):
+    """Write data to path with a single unbuffered fd."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
 def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     repo_root = os.path.dirname(script_dir)
 
-    with open(os.path.join(repo_root, "schedules", "jobs.json")) as f:
-        jobs = json.load(f)
+    with open(os.path.join(repo_root, "schedules", "jobs.json"), "rb") as f:
+        jobs = orjson.loads(f.read())
 
-    week_days = get_week_range()
-    html = generate_html(jobs, week_days)
+    now = datetime.now(DISPLAY_TZ)
+    week_days = get_week_range(now)
+    html = generate_html(jobs, week_days, now)
 
     out_path = os.path.join(repo_root, "docs", "index.html")
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    with open(out_path, "w") as f:
-        f.write(html)
+    write_bytes(out_path, html.encode("utf-8"))
+
+    # Static stylesheet: only rewritten when STYLE_CSS changes
+    css_path = os.path.join(repo_root, "docs", "style.css")
+    css = STYLE_CSS.encode("utf-8")
+    try:
+        with open(css_path, "rb") as f:
+            css_changed = f.read() != css
+    except FileNotFoundError:
+        css_changed = True
+    if css_changed:
+        write_bytes(css_path, css)
 
     print(f"✅ Generated: {out_path}")
 
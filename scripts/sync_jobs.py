@@ -4,14 +4,20 @@ sync_jobs.py - Sync OpenClaw cron jobs → schedules/jobs.json → regenerate ca
 Run by OpenClaw cron daily.
 """
 
-import json
 import os
 import subprocess
 import sys
 
+import orjson
+
+import generate
+
 REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 JOBS_PATH = os.path.join(REPO_DIR, "schedules", "jobs.json")
 
+# Files the sync may change, relative to REPO_DIR
+SYNC_PATHS = ["schedules/jobs.json", "docs/index.html", "docs/style.css"]
+
 # Default color/tag mapping (by name pattern)
 TAG_COLORS = {
     "openclaw": "#4A90D9",
@@ -28,20 +34,20 @@ NAME_COLORS = {
 def get_openclaw_jobs():
     result = subprocess.run(
         ["openclaw", "cron", "list", "--json"],
-        capture_output=True, text=True
+        capture_output=True
     )
     if result.returncode != 0:
-        print(f"Error: {result.stderr}", file=sys.stderr)
+        print(f"Error: {result.stderr.decode(errors='replace')}", file=sys.stderr)
         sys.exit(1)
-    data = json.loads(result.stdout)
+    data = orjson.loads(result.stdout)
     return data.get("jobs", [])
 
 def normalize(jobs):
     # Load existing for color/tag preservation
     existing = {}
     if os.path.exists(JOBS_PATH):
-        with open(JOBS_PATH) as f:
-            for j in json.load(f):
+        with open(JOBS_PATH, "rb") as f:
+            for j in orjson.loads(f.read()):
                 existing[j["name"]] = j
 
     result = []
@@ -85,20 +91,20 @@ def main():
 
     normalized = normalize(jobs)
 
-    with open(JOBS_PATH, "w") as f:
-        json.dump(normalized, f, indent=2, ensure_ascii=False)
+    with open(JOBS_PATH, "wb") as f:
+        f.write(orjson.dumps(normalized, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     print(f"✅ Updated: {JOBS_PATH}")
 
-    # Regenerate calendar HTML
-    generate_script = os.path.join(REPO_DIR, "scripts", "generate.py")
-    subprocess.run(["python3", generate_script], check=True)
+    # Regenerate calendar HTML in-process (no second interpreter start-up)
+    generate.main()
 
-    # Git commit & push
-    subprocess.run(["git", "-C", REPO_DIR, "add", "-A"], check=True)
-    result = subprocess.run(
-        ["git", "-C", REPO_DIR, "diff", "--cached", "--quiet"]
+    # Git commit & push (one status call decides; nothing else runs if clean)
+    status = subprocess.run(
+        ["git", "-C", REPO_DIR, "status", "--porcelain", "-z", "--", *SYNC_PATHS],
+        capture_output=True, check=True
     )
-    if result.returncode != 0:
+    if status.stdout:
+        subprocess.run(["git", "-C", REPO_DIR, "add", "--", *SYNC_PATHS], check=True)
         subprocess.run([
             "git", "-C", REPO_DIR, "commit",
             "-m", "chore: sync openclaw cron jobs"